@@ -1,8 +1,9 @@
 """FastAPI application for wound infection risk estimation."""
 from __future__ import annotations
 
-import io
+import asyncio
 import logging
+import os
 from pathlib import Path
 from typing import List
 
@@ -12,7 +13,8 @@ from fastapi import FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.ml.registry import load_model
 from src.ml.scoring import SymptomInputs
@@ -21,16 +23,92 @@ from src.utils.network import get_lan_ip
 LOGGER = logging.getLogger("wound-risk")
 
 MAX_FILE_BYTES = 5 * 1024 * 1024
+# Headroom for multipart framing and the symptom form fields.
+MAX_REQUEST_BYTES = MAX_FILE_BYTES + 64 * 1024
+FILE_TOO_LARGE_DETAIL = "File too large. Limit is 5MB."
+# JPEG uploads above this size (typically full-resolution phone photos) are decoded at half size.
+REDUCED_DECODE_MIN_BYTES = 1_000_000
+JPEG_MAGIC = b"\xff\xd8\xff"
 ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/heic", "image/heif"}
+INDEX_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
+class UploadSizeLimitMiddleware:
+    """Reject /assess bodies larger than ``max_bytes`` before the form is parsed.
+
+    A declared Content-Length is checked up front. Bodies without one (chunked
+    uploads) are counted as they arrive, and reading stops as soon as the limit
+    is passed instead of letting the multipart parser spool the rest to disk.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] != "/assess":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._reject(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, too_large
+            if too_large:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Report a disconnect so the app stops reading the body.
+                    too_large = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if too_large and not response_started:
+                # Drop the app's response to the aborted body; a 413 is sent below.
+                return
+            response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not too_large:
+                raise
+        if too_large and not response_started:
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(status_code=413, content={"detail": FILE_TOO_LARGE_DETAIL})
+        await response(scope, receive, send)
+
 
 app = FastAPI(title="Wound Infection Risk API", version="0.1.0")
 WEB_DIR = Path(__file__).resolve().parent / "web"
+WEIGHTS_PATH = Path(__file__).resolve().parents[2] / "config" / "weights.yaml"
+
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_REQUEST_BYTES)
 
+# The web UI may point at the backend by LAN IP from another origin, so any origin
+# is allowed (without credentials) unless CORS_ORIGINS narrows it to a
+# comma-separated list.
+CORS_ORIGINS = [origin.strip() for origin in os.environ.get("CORS_ORIGINS", "").split(",") if origin.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"] ,
+    allow_origins=CORS_ORIGINS or ["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
@@ -38,6 +116,9 @@ app.mount("/static", StaticFiles(directory=WEB_DIR), name="static")
 
 
 class Signal(BaseModel):
+    # Lets AssessResponse validate SignalDetail dataclasses directly.
+    model_config = ConfigDict(from_attributes=True)
+
     name: str
     value: float
     weight: float
@@ -56,7 +137,13 @@ class AssessResponse(BaseModel):
 @app.on_event("startup")
 async def startup_event() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
-    lan_ip = get_lan_ip()
+    # The hostname lookup can stall on a misconfigured resolver, so it runs in the
+    # background; the task is kept on app.state so it is not garbage collected.
+    app.state.lan_ip_task = asyncio.create_task(_log_lan_ip())
+
+
+async def _log_lan_ip() -> None:
+    lan_ip = await asyncio.to_thread(get_lan_ip)
     LOGGER.info("Backend running. iPhone app can connect at: http://%s:8000", lan_ip)
 
 
@@ -67,7 +154,7 @@ async def health() -> dict:
 
 @app.get("/")
 async def index() -> FileResponse:
-    return FileResponse(WEB_DIR / "index.html")
+    return FileResponse(WEB_DIR / "index.html", headers=INDEX_CACHE_HEADERS)
 
 
 @app.post("/assess", response_model=AssessResponse)
@@ -78,22 +165,16 @@ async def assess(
     reported_swelling: bool = Form(False),
     reported_drainage: bool = Form(False),
     reported_spreading_redness: bool = Form(False),
-) -> JSONResponse:
+) -> AssessResponse:
     if file.content_type not in ALLOWED_MIME_TYPES:
         raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a JPG or PNG image.")
 
-    contents = await file.read()
+    # Starlette has already spooled the upload to a temporary file; reading at most
+    # one byte past the limit keeps an oversized one from being loaded into memory.
+    contents = await file.read(MAX_FILE_BYTES + 1)
     if len(contents) > MAX_FILE_BYTES:
-        raise HTTPException(status_code=400, detail="File too large. Limit is 5MB.")
-
-    image = _decode_image(contents)
-    if image is None:
-        raise HTTPException(status_code=400, detail="Unable to decode image.")
+        raise HTTPException(status_code=413, detail=FILE_TOO_LARGE_DETAIL)
 
-    model = load_model(
-        model_name="heuristic",
-        weights_path=Path(__file__).resolve().parents[2] / "config" / "weights.yaml",
-    )
     symptoms = SymptomInputs(
         reported_pain=reported_pain,
         reported_warmth=reported_warmth,
@@ -101,28 +182,47 @@ async def assess(
         reported_drainage=reported_drainage,
         reported_spreading_redness=reported_spreading_redness,
     )
-    result = model.predict(image, symptoms=symptoms)
-    response = AssessResponse(
+    return await asyncio.to_thread(_run_pipeline, contents, symptoms)
+
+
+def _run_pipeline(contents: bytes, symptoms: SymptomInputs) -> AssessResponse:
+    """Decode and score an upload; CPU-bound, so callers run it off the event loop."""
+    decoded = _decode_image(contents)
+    if decoded is None:
+        raise HTTPException(status_code=400, detail="Unable to decode image.")
+
+    model = load_model(model_name="heuristic", weights_path=WEIGHTS_PATH)
+    image, scale = decoded
+    result = model.predict(image, symptoms=symptoms, scale=scale)
+    return AssessResponse(
         risk_score=result.risk_score,
         risk_level=result.risk_level,
-        signals=[Signal(**detail.__dict__) for detail in result.signals],
+        signals=result.signals,
         explanation=result.explanation,
         disclaimer=result.disclaimer,
         recommended_next_steps=result.recommended_next_steps,
     )
-    return JSONResponse(content=response.dict())
 
 
-def _decode_image(contents: bytes) -> np.ndarray | None:
-    """Decode image bytes into BGR array and strip metadata."""
+def _decode_image(contents: bytes) -> tuple[np.ndarray, float] | None:
+    """Decode image bytes into BGR array and strip metadata.
+
+    Large JPEG uploads are decoded at half resolution; libjpeg scales in the
+    DCT domain, which is much cheaper than a full decode. Other formats would
+    be fully decoded and then resized, so they always decode at full size.
+
+    Returns the image and its scale relative to the upload (1.0 or 0.5), which
+    the feature extractor uses to size the periwound ring.
+    """
+    reduce = len(contents) > REDUCED_DECODE_MIN_BYTES and contents[:3] == JPEG_MAGIC
+    flag = cv2.IMREAD_REDUCED_COLOR_2 if reduce else cv2.IMREAD_COLOR
     try:
         image_array = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+        image = cv2.imdecode(image_array, flag)
     except Exception:  # noqa: BLE001
         return None
 
     if image is None:
         return None
 
-    _ = io.BytesIO()
-    return image
+    return image, 0.5 if reduce else 1.0
@@ -7,6 +7,13 @@ from typing import Dict
 import cv2
 import numpy as np
 
+# Longest image side used for GrabCut; its cost grows with the pixel count.
+GRABCUT_MAX_SIDE = 256
+# With a fixed rectangle prior the GrabCut mask settles after a couple of passes.
+GRABCUT_ITERATIONS = 2
+# Width in pixels of the periwound ring at the original photo resolution.
+PERIWOUND_RING_WIDTH = 18
+
 
 @dataclass
 class FeatureSignals:
@@ -29,20 +36,32 @@ class FeatureSignals:
 class FeatureExtractor:
     """Extracts heuristic features from a wound image."""
 
-    def extract(self, image_bgr: np.ndarray) -> FeatureSignals:
+    def extract(self, image_bgr: np.ndarray, scale: float = 1.0) -> FeatureSignals:
         """Extract signals from a BGR image.
 
         Args:
             image_bgr: Image as a BGR uint8 numpy array.
+            scale: Resolution of ``image_bgr`` relative to the original photo,
+                e.g. 0.5 when it was decoded at half size. The periwound ring
+                width is scaled so the color proxies stay comparable, and edges
+                are detected at the original resolution so ``swelling_proxy``
+                does not depend on the decode size.
         """
-        wound_mask = self._segment_wound(image_bgr)
-        image_bgr, wound_mask = self._crop_to_wound(image_bgr, wound_mask)
-        periwound_mask = self._periwound_ring(wound_mask, ring_width=18)
+        gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+        wound_mask = self._segment_wound(image_bgr, gray)
+        image_bgr, gray, wound_mask = self._crop_to_wound(image_bgr, gray, wound_mask)
+        ring_width = max(int(round(PERIWOUND_RING_WIDTH * scale)), 1)
+        periwound_mask = self._periwound_ring(wound_mask, ring_width=ring_width)
 
-        redness = self._periwound_redness(image_bgr, periwound_mask)
-        exudate = self._exudate_proxy(image_bgr, wound_mask)
-        dark = self._dark_tissue_proxy(image_bgr, wound_mask)
-        swelling = self._swelling_proxy(image_bgr, periwound_mask)
+        # Convert once and share the results across all proxies.
+        hsv = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2HSV)
+        edge_gray, edge_ring = self._resize_for_edges(gray, periwound_mask, scale)
+        edges = cv2.Canny(edge_gray, 60, 120)
+
+        redness = self._periwound_redness(hsv, periwound_mask)
+        exudate = self._exudate_proxy(hsv, wound_mask)
+        dark = self._dark_tissue_proxy(hsv, wound_mask)
+        swelling = self._swelling_proxy(edges, edge_ring)
 
         return FeatureSignals(
             periwound_redness=redness,
@@ -51,34 +70,60 @@ class FeatureExtractor:
             swelling_proxy=swelling,
         )
 
-    def _segment_wound(self, image_bgr: np.ndarray) -> np.ndarray:
-        """Approximate wound segmentation using GrabCut with fallback."""
+    def _segment_wound(self, image_bgr: np.ndarray, gray: np.ndarray) -> np.ndarray:
+        """Approximate wound segmentation using GrabCut with fallback.
+
+        GrabCut runs on a copy no larger than ``GRABCUT_MAX_SIDE`` pixels on its
+        long edge; the resulting mask is scaled back to the input size.
+        """
         height, width = image_bgr.shape[:2]
-        mask = np.zeros((height, width), np.uint8)
-        rect = (int(width * 0.1), int(height * 0.1), int(width * 0.8), int(height * 0.8))
+        scale = min(1.0, GRABCUT_MAX_SIDE / max(height, width))
+        if scale < 1.0:
+            small_size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+            small_bgr = cv2.resize(image_bgr, small_size, interpolation=cv2.INTER_AREA)
+        else:
+            small_bgr = image_bgr
+        small_height, small_width = small_bgr.shape[:2]
+
+        mask = np.zeros((small_height, small_width), np.uint8)
+        rect = (
+            int(small_width * 0.1),
+            int(small_height * 0.1),
+            int(small_width * 0.8),
+            int(small_height * 0.8),
+        )
         bgd_model = np.zeros((1, 65), np.float64)
         fgd_model = np.zeros((1, 65), np.float64)
         try:
-            cv2.grabCut(image_bgr, mask, rect, bgd_model, fgd_model, 5, cv2.GC_INIT_WITH_RECT)
-            wound_mask = np.where((mask == cv2.GC_FGD) | (mask == cv2.GC_PR_FGD), 1, 0).astype("uint8")
+            cv2.grabCut(
+                small_bgr, mask, rect, bgd_model, fgd_model, GRABCUT_ITERATIONS, cv2.GC_INIT_WITH_RECT
+            )
+            # GC_FGD (1) and GC_PR_FGD (3) are the labels with the low bit set.
+            wound_mask = np.bitwise_and(mask, 1)
+            if small_bgr is not image_bgr:
+                wound_mask = cv2.resize(wound_mask, (width, height), interpolation=cv2.INTER_NEAREST)
         except cv2.error:
-            wound_mask = self._fallback_otsu(image_bgr)
+            wound_mask = self._fallback_otsu(gray)
 
         wound_mask = cv2.morphologyEx(wound_mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
         return wound_mask
 
     def _crop_to_wound(
-        self, image_bgr: np.ndarray, wound_mask: np.ndarray, padding_ratio: float = 0.12
-    ) -> tuple[np.ndarray, np.ndarray]:
-        """Crop the image to the wound bounding box with padding."""
+        self,
+        image_bgr: np.ndarray,
+        gray: np.ndarray,
+        wound_mask: np.ndarray,
+        padding_ratio: float = 0.12,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Crop the image, its grayscale copy and the mask to the wound bounding box with padding."""
         contours, _ = cv2.findContours(wound_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         if not contours:
-            return image_bgr, wound_mask
+            return image_bgr, gray, wound_mask
 
         largest = max(contours, key=cv2.contourArea)
         x, y, w, h = cv2.boundingRect(largest)
         if w == 0 or h == 0:
-            return image_bgr, wound_mask
+            return image_bgr, gray, wound_mask
 
         pad = int(max(w, h) * padding_ratio)
         height, width = image_bgr.shape[:2]
@@ -88,53 +133,62 @@ class FeatureExtractor:
         y1 = min(y + h + pad, height)
 
         cropped_image = image_bgr[y0:y1, x0:x1].copy()
+        cropped_gray = gray[y0:y1, x0:x1].copy()
         cropped_mask = wound_mask[y0:y1, x0:x1].copy()
-        return cropped_image, cropped_mask
+        return cropped_image, cropped_gray, cropped_mask
 
-    def _fallback_otsu(self, image_bgr: np.ndarray) -> np.ndarray:
-        gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+    def _fallback_otsu(self, gray: np.ndarray) -> np.ndarray:
         blur = cv2.GaussianBlur(gray, (5, 5), 0)
-        _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        return (thresh == 0).astype("uint8")
+        _, wound_mask = cv2.threshold(blur, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        return wound_mask
 
     def _periwound_ring(self, wound_mask: np.ndarray, ring_width: int) -> np.ndarray:
-        kernel = np.ones((ring_width, ring_width), np.uint8)
-        dilated = cv2.dilate(wound_mask, kernel, iterations=1)
-        eroded = cv2.erode(wound_mask, kernel, iterations=1)
-        ring = np.clip(dilated - eroded, 0, 1).astype("uint8")
-        return ring
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (ring_width, ring_width))
+        # Gradient is dilation minus erosion, i.e. the ring around a 0/1 mask.
+        return cv2.morphologyEx(wound_mask, cv2.MORPH_GRADIENT, kernel)
 
-    def _periwound_redness(self, image_bgr: np.ndarray, periwound_mask: np.ndarray) -> float:
-        hsv = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2HSV)
-        h, s, _ = cv2.split(hsv)
-        red_mask = ((h < 10) | (h > 160)) & (s > 80)
-        region = periwound_mask.astype(bool)
-        if region.sum() == 0:
-            return 0.0
-        return float(red_mask[region].mean())
-
-    def _exudate_proxy(self, image_bgr: np.ndarray, wound_mask: np.ndarray) -> float:
-        hsv = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2HSV)
-        h, s, v = cv2.split(hsv)
-        exudate_mask = (h > 20) & (h < 90) & (s > 60) & (v > 80)
-        region = wound_mask.astype(bool)
-        if region.sum() == 0:
-            return 0.0
-        return float(exudate_mask[region].mean())
-
-    def _dark_tissue_proxy(self, image_bgr: np.ndarray, wound_mask: np.ndarray) -> float:
-        hsv = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2HSV)
-        _, _, v = cv2.split(hsv)
-        dark_mask = v < 40
-        region = wound_mask.astype(bool)
-        if region.sum() == 0:
-            return 0.0
-        return float(dark_mask[region].mean())
-
-    def _swelling_proxy(self, image_bgr: np.ndarray, periwound_mask: np.ndarray) -> float:
-        gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 60, 120)
-        region = periwound_mask.astype(bool)
-        if region.sum() == 0:
-            return 0.0
-        return float((edges > 0)[region].mean())
+    def _resize_for_edges(
+        self, gray: np.ndarray, periwound_mask: np.ndarray, scale: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Scale the grayscale crop and ring mask back to the original photo resolution.
+
+        Canny edge density depends on pixel scale, so a reduced decode would
+        otherwise read roughly twice as edgy as the same photo at full size.
+        """
+        if scale == 1.0:
+            return gray, periwound_mask
+        height, width = gray.shape[:2]
+        size = (max(int(round(width / scale)), 1), max(int(round(height / scale)), 1))
+        edge_gray = cv2.resize(gray, size, interpolation=cv2.INTER_LINEAR)
+        edge_ring = cv2.resize(periwound_mask, size, interpolation=cv2.INTER_NEAREST)
+        return edge_gray, edge_ring
+
+    def _periwound_redness(self, hsv: np.ndarray, periwound_mask: np.ndarray) -> float:
+        # Red hue wraps around 0, so combine the low and high hue bands.
+        red_low = cv2.inRange(hsv, (0, 81, 0), (9, 255, 255))
+        red_high = cv2.inRange(hsv, (161, 81, 0), (180, 255, 255))
+        red_mask = cv2.bitwise_or(red_low, red_high)
+        return _masked_fraction(red_mask, periwound_mask)
+
+    def _exudate_proxy(self, hsv: np.ndarray, wound_mask: np.ndarray) -> float:
+        exudate_mask = cv2.inRange(hsv, (21, 61, 81), (89, 255, 255))
+        return _masked_fraction(exudate_mask, wound_mask)
+
+    def _dark_tissue_proxy(self, hsv: np.ndarray, wound_mask: np.ndarray) -> float:
+        dark_mask = cv2.inRange(hsv, (0, 0, 0), (180, 255, 39))
+        return _masked_fraction(dark_mask, wound_mask)
+
+    def _swelling_proxy(self, edges: np.ndarray, periwound_mask: np.ndarray) -> float:
+        return _masked_fraction(edges, periwound_mask)
+
+
+def _masked_fraction(signal_mask: np.ndarray, region_mask: np.ndarray) -> float:
+    """Fraction of non-zero ``region_mask`` pixels that are also set in ``signal_mask``.
+
+    Both masks are uint8 so the counts stay inside OpenCV instead of
+    materialising boolean index arrays.
+    """
+    region_count = cv2.countNonZero(region_mask)
+    if region_count == 0:
+        return 0.0
+    return cv2.countNonZero(cv2.bitwise_and(signal_mask, region_mask)) / region_count
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Protocol
 
@@ -14,7 +15,9 @@ from .scoring import RiskResult, RiskScorer, SymptomInputs
 class RiskModel(Protocol):
     """Protocol for risk models."""
 
-    def predict(self, image_bgr: np.ndarray, symptoms: SymptomInputs | None = None) -> RiskResult:
+    def predict(
+        self, image_bgr: np.ndarray, symptoms: SymptomInputs | None = None, scale: float = 1.0
+    ) -> RiskResult:
         ...
 
 
@@ -28,8 +31,10 @@ class HeuristicRiskModel:
         self.extractor = FeatureExtractor()
         self.scorer = RiskScorer(self.weights_path)
 
-    def predict(self, image_bgr: np.ndarray, symptoms: SymptomInputs | None = None) -> RiskResult:
-        signals = self.extractor.extract(image_bgr)
+    def predict(
+        self, image_bgr: np.ndarray, symptoms: SymptomInputs | None = None, scale: float = 1.0
+    ) -> RiskResult:
+        signals = self.extractor.extract(image_bgr, scale=scale)
         return self.scorer.score(signals, symptoms=symptoms)
 
 
@@ -39,15 +44,21 @@ class TorchModelStub:
 
     model_path: Path
 
-    def predict(self, image_bgr: np.ndarray, symptoms: SymptomInputs | None = None) -> RiskResult:
+    def predict(
+        self, image_bgr: np.ndarray, symptoms: SymptomInputs | None = None, scale: float = 1.0
+    ) -> RiskResult:
         raise NotImplementedError(
             "TODO: Load and run a trained PyTorch model, then map outputs to RiskResult."
         )
 
 
+@lru_cache(maxsize=4)
 def load_model(model_name: str, weights_path: Path, model_path: Path | None = None) -> RiskModel:
     """Load a risk model based on configuration.
 
+    Models are cached per argument tuple, so repeated calls reuse the same
+    instance instead of re-reading weights from disk.
+
     Args:
         model_name: Either 'heuristic' or 'torch'.
         weights_path: Path to scoring weights (heuristic).
@@ -2,13 +2,58 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import yaml
 
 from .features import FeatureSignals
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+_DISCLAIMER = (
+    "This output is a non-diagnostic risk estimation for triage support only. "
+    "It cannot diagnose infection and should not replace clinical evaluation."
+)
+
+# Lower score bounds for "medium" and "high"; a score equal to a bound takes the higher level.
+_LEVEL_THRESHOLDS = np.array([0.33, 0.66])
+_LEVELS = ("low", "medium", "high")
+
+_DEFAULT_NOTE = "Signal observed in the image."
+
+_NOTES: Dict[str, str] = {
+    "periwound_redness": "Higher redness near the wound boundary may be associated with irritation.",
+    "exudate_proxy": "Yellow/green coloration can be a proxy for exudate-like appearance.",
+    "dark_tissue_proxy": "Darker regions may indicate non-viable tissue presence.",
+    "swelling_proxy": "Edge sharpness can be a proxy for localized swelling cues.",
+    "reported_pain": "Pain or tenderness near the wound can be a reported symptom of irritation.",
+    "reported_warmth": "A warm or hot sensation around the wound can indicate inflammation.",
+    "reported_swelling": "Swelling around the wound can be a sign of irritation or inflammation.",
+    "reported_drainage": "Drainage or pus-like fluid can be a reported sign of infection.",
+    "reported_spreading_redness": "Redness spreading beyond the wound may indicate inflammation.",
+}
+
+_STEPS_BY_LEVEL: Dict[str, Tuple[str, ...]] = {
+    "high": (
+        "Consider scheduling a clinical check if symptoms persist or worsen.",
+        "Monitor for changes such as increasing redness, swelling, or drainage.",
+    ),
+    "medium": (
+        "Continue monitoring and recheck if the appearance changes.",
+        "Seek clinical advice if you are concerned about progression.",
+    ),
+    "low": (
+        "Keep monitoring for noticeable changes over time.",
+        "If you have concerns, seek clinical guidance.",
+    ),
+}
+
 
 @dataclass
 class SymptomInputs:
@@ -53,35 +98,23 @@ class RiskScorer:
 
     def __init__(self, weights_path: Path) -> None:
         self.weights = self._load_weights(weights_path)
+        # The signal schema is fixed, so weights are laid out once as vectors.
+        self._bias = float(self.weights.get("bias", 0.0))
+        self._visual_names = self._visual_signal_names()
+        self._symptom_names = self._symptom_signal_names()
+        self._w_visual = np.array([self.weights.get(name, 0.0) for name in self._visual_names], dtype=np.float64)
+        self._w_symptom = np.array([self.weights.get(name, 0.0) for name in self._symptom_names], dtype=np.float64)
 
     def score(self, signals: FeatureSignals, symptoms: SymptomInputs | None = None) -> RiskResult:
-        signals_dict = signals.as_dict()
-        weighted_sum = self.weights.get("bias", 0.0)
-        details: List[SignalDetail] = []
-        for name, value in signals_dict.items():
-            weight = float(self.weights.get(name, 0.0))
-            weighted_sum += weight * value
-            details.append(
-                SignalDetail(
-                    name=name,
-                    value=float(value),
-                    weight=weight,
-                    note=self._signal_note(name, value),
-                )
-            )
+        visual_values = np.array([getattr(signals, name) for name in self._visual_names], dtype=np.float64)
+        weighted_sum = self._bias + float(self._w_visual @ visual_values)
+        details = self._details(self._visual_names, self._w_visual, visual_values)
 
         if symptoms is not None:
-            for name, value in symptoms.as_dict().items():
-                weight = float(self.weights.get(name, 0.0))
-                weighted_sum += weight * value
-                details.append(
-                    SignalDetail(
-                        name=name,
-                        value=float(value),
-                        weight=weight,
-                        note=self._signal_note(name, value),
-                    )
-                )
+            symptom_dict = symptoms.as_dict()
+            symptom_values = np.array([symptom_dict[name] for name in self._symptom_names], dtype=np.float64)
+            weighted_sum += float(self._w_symptom @ symptom_values)
+            details.extend(self._details(self._symptom_names, self._w_symptom, symptom_values))
 
         risk_score = min(max(weighted_sum, 0.0), 1.0)
         risk_level = self._risk_level(risk_score)
@@ -91,39 +124,24 @@ class RiskScorer:
             risk_level=risk_level,
             signals=details,
             explanation=explanation,
-            disclaimer=(
-                "This output is a non-diagnostic risk estimation for triage support only. "
-                "It cannot diagnose infection and should not replace clinical evaluation."
-            ),
+            disclaimer=_DISCLAIMER,
             recommended_next_steps=self._recommended_steps(risk_level),
         )
 
+    def _details(self, names: List[str], weights: np.ndarray, values: np.ndarray) -> List[SignalDetail]:
+        return [
+            SignalDetail(name=name, value=value, weight=weight, note=self._signal_note(name, value))
+            for name, weight, value in zip(names, weights.tolist(), values.tolist())
+        ]
+
     def _load_weights(self, weights_path: Path) -> Dict[str, float]:
-        with weights_path.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle)
-        return {key: float(value) for key, value in data.items()}
+        return _read_weights(weights_path)
 
     def _risk_level(self, score: float) -> str:
-        if score >= 0.66:
-            return "high"
-        if score >= 0.33:
-            return "medium"
-        return "low"
+        return _LEVELS[int(np.searchsorted(_LEVEL_THRESHOLDS, score, side="right"))]
 
     def _signal_note(self, name: str, value: float) -> str:
-        notes = {
-            "periwound_redness": "Higher redness near the wound boundary may be associated with irritation.",
-            "exudate_proxy": "Yellow/green coloration can be a proxy for exudate-like appearance.",
-            "dark_tissue_proxy": "Darker regions may indicate non-viable tissue presence.",
-            "swelling_proxy": "Edge sharpness can be a proxy for localized swelling cues.",
-            "reported_pain": "Pain or tenderness near the wound can be a reported symptom of irritation.",
-            "reported_warmth": "A warm or hot sensation around the wound can indicate inflammation.",
-            "reported_swelling": "Swelling around the wound can be a sign of irritation or inflammation.",
-            "reported_drainage": "Drainage or pus-like fluid can be a reported sign of infection.",
-            "reported_spreading_redness": "Redness spreading beyond the wound may indicate inflammation.",
-        }
-        base = notes.get(name, "Signal observed in the image.")
-        return f"{base} Signal intensity: {value:.2f}."
+        return f"{_NOTES.get(name, _DEFAULT_NOTE)} Signal intensity: {value:.2f}."
 
     def _explanation(self, details: List[SignalDetail], level: str) -> str:
         visual_details = [detail for detail in details if detail.name in self._visual_signal_names()]
@@ -182,17 +200,12 @@ class RiskScorer:
         return f"Reported symptoms include {', '.join(cues)}."
 
     def _recommended_steps(self, level: str) -> List[str]:
-        if level == "high":
-            return [
-                "Consider scheduling a clinical check if symptoms persist or worsen.",
-                "Monitor for changes such as increasing redness, swelling, or drainage.",
-            ]
-        if level == "medium":
-            return [
-                "Continue monitoring and recheck if the appearance changes.",
-                "Seek clinical advice if you are concerned about progression.",
-            ]
-        return [
-            "Keep monitoring for noticeable changes over time.",
-            "If you have concerns, seek clinical guidance.",
-        ]
+        return list(_STEPS_BY_LEVEL.get(level, _STEPS_BY_LEVEL["low"]))
+
+
+@lru_cache(maxsize=8)
+def _read_weights(weights_path: Path) -> Dict[str, float]:
+    """Parse a weights file once per path; scorers share the resulting dict."""
+    with weights_path.open("r", encoding="utf-8") as handle:
+        data = yaml.load(handle, Loader=_YamlLoader)
+    return {key: float(value) for key, value in data.items()}
@@ -2,13 +2,16 @@
 from __future__ import annotations
 
 import socket
+from functools import lru_cache
 from typing import Optional
 
 
+@lru_cache(maxsize=1)
 def get_lan_ip() -> str:
     """Best-effort detection of the host's LAN IP address.
 
     Returns a non-loopback IPv4 address when possible, otherwise 127.0.0.1.
+    The result is cached for the lifetime of the process.
     """
     ip: Optional[str] = None
     try:
@@ -1,10 +1,11 @@
+import asyncio
 from pathlib import Path
 
 import cv2
 import numpy as np
 from fastapi.testclient import TestClient
 
-from src.api.main import app
+from src.api.main import REDUCED_DECODE_MIN_BYTES, UploadSizeLimitMiddleware, _decode_image, app
 
 client = TestClient(app)
 
@@ -23,6 +24,12 @@ def test_health_endpoint() -> None:
     assert response.json() == {"status": "ok"}
 
 
+def test_index_is_cacheable() -> None:
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=3600"
+
+
 def test_assess_happy_path() -> None:
     image_bytes = _make_image_bytes()
     response = client.post(
@@ -41,3 +48,89 @@ def test_assess_invalid_file_type() -> None:
         files={"file": ("test.txt", b"notanimage", "text/plain")},
     )
     assert response.status_code == 400
+
+
+def test_assess_rejects_oversized_upload() -> None:
+    response = client.post(
+        "/assess",
+        files={"file": ("big.png", b"\x00" * (6 * 1024 * 1024), "image/png")},
+    )
+    assert response.status_code == 413
+
+
+def test_assess_rejects_oversized_chunked_upload() -> None:
+    boundary = "testboundary"
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="big.png"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    def body():
+        yield head
+        for _ in range(6):
+            yield b"\x00" * (1024 * 1024)
+        yield tail
+
+    response = client.post(
+        "/assess",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert response.status_code == 413
+
+
+def test_upload_limit_stops_reading_chunked_body() -> None:
+    chunks = [{"type": "http.request", "body": b"x" * 100, "more_body": True} for _ in range(10)]
+    pulled = []
+    sent = []
+
+    async def receive() -> dict:
+        message = chunks[len(pulled)]
+        pulled.append(message)
+        return message
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    async def read_all(scope: dict, receive, send) -> None:
+        while (await receive())["type"] == "http.request":
+            pass
+        raise RuntimeError("client disconnected")
+
+    middleware = UploadSizeLimitMiddleware(read_all, max_bytes=250)
+    scope = {"type": "http", "path": "/assess", "headers": []}
+    asyncio.run(middleware(scope, receive, send))
+
+    assert len(pulled) == 3
+    assert sent[0]["status"] == 413
+
+
+def test_decode_image_reduces_only_large_jpegs() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (1200, 1600, 3), dtype=np.uint8)
+
+    success, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    assert success and len(jpeg) > REDUCED_DECODE_MIN_BYTES
+    decoded, scale = _decode_image(jpeg.tobytes())
+    assert decoded.shape[:2] == (600, 800)
+    assert scale == 0.5
+
+    success, png = cv2.imencode(".png", image)
+    assert success and len(png) > REDUCED_DECODE_MIN_BYTES
+    decoded, scale = _decode_image(png.tobytes())
+    assert decoded.shape[:2] == (1200, 1600)
+    assert scale == 1.0
+
+
+def test_cross_origin_requests_allowed_by_default() -> None:
+    origin = "http://localhost:8000"
+    response = client.get("/health", headers={"Origin": origin})
+    assert response.headers["access-control-allow-origin"] == "*"
+
+    preflight = client.options(
+        "/assess",
+        headers={"Origin": origin, "Access-Control-Request-Method": "POST"},
+    )
+    assert preflight.status_code == 200
@@ -1,3 +1,4 @@
+import cv2
 import numpy as np
 
 from src.ml.features import FeatureExtractor
@@ -12,3 +13,33 @@ def test_feature_extraction_returns_ranges() -> None:
 
     for value in signals.as_dict().values():
         assert 0.0 <= value <= 1.0
+
+
+def test_segmentation_mask_matches_large_input() -> None:
+    image = np.zeros((600, 900, 3), dtype=np.uint8)
+    image[150:450, 250:650, :] = [10, 10, 200]
+
+    extractor = FeatureExtractor()
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    mask = extractor._segment_wound(image, gray)
+
+    assert mask.shape == image.shape[:2]
+    assert mask[300, 450] == 1
+
+
+def test_signals_match_across_decode_scales() -> None:
+    rng = np.random.default_rng(0)
+    height, width = 1500, 2000
+    texture = cv2.resize(rng.normal(0, 25, (height // 8, width // 8, 3)), (width, height))
+    image = np.clip(np.array([120, 150, 200]) + texture + rng.normal(0, 6, (height, width, 3)), 0, 255)
+    cv2.ellipse(image, (1000, 750), (450, 350), 0, 0, 360, (40, 40, 170), -1)
+    cv2.ellipse(image, (1000, 750), (550, 425), 0, 0, 360, (60, 70, 210), 30)
+    success, jpeg = cv2.imencode(".jpg", image.astype(np.uint8), [cv2.IMWRITE_JPEG_QUALITY, 92])
+    assert success
+
+    extractor = FeatureExtractor()
+    full = extractor.extract(cv2.imdecode(jpeg, cv2.IMREAD_COLOR), scale=1.0).as_dict()
+    reduced = extractor.extract(cv2.imdecode(jpeg, cv2.IMREAD_REDUCED_COLOR_2), scale=0.5).as_dict()
+
+    for name, value in full.items():
+        assert abs(reduced[name] - value) < 0.03, name
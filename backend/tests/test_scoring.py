@@ -11,3 +11,17 @@ def test_scoring_outputs_expected_level() -> None:
     assert result.risk_score >= 0.0
     assert result.risk_level in {"low", "medium", "high"}
     assert result.explanation
+
+
+def test_scorers_share_cached_weights() -> None:
+    weights_path = Path(__file__).resolve().parents[1] / "config" / "weights.yaml"
+    assert RiskScorer(weights_path).weights is RiskScorer(weights_path).weights
+
+
+def test_risk_level_boundaries() -> None:
+    scorer = RiskScorer(Path(__file__).resolve().parents[1] / "config" / "weights.yaml")
+    assert scorer._risk_level(0.0) == "low"
+    assert scorer._risk_level(0.3299) == "low"
+    assert scorer._risk_level(0.33) == "medium"
+    assert scorer._risk_level(0.66) == "high"
+    assert scorer._risk_level(1.0) == "high"